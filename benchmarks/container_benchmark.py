@@ -0,0 +1,75 @@
+"""Benchmark pack, unpack and single-member lookup against plain file copies.
+
+Run from the repository root::
+
+    python -m benchmarks.container_benchmark --files 100000
+"""
+
+import argparse
+import random
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+
+from src.operations.file_operations import FileOperations
+
+
+def build_tree(root: Path, files: int, size: int) -> None:
+    """Create ``files`` small files spread over 100 directories."""
+    payload = b"x" * size
+    for i in range(files):
+        directory = root / f"d{i % 100:02d}"
+        directory.mkdir(exist_ok=True)
+        (directory / f"f{i}.txt").write_bytes(payload)
+
+
+def timed(label: str, func: Callable[[], object]) -> float:
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {elapsed:8.3f}s")
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=20000)
+    parser.add_argument("--size", type=int, default=512, help="bytes per file")
+    parser.add_argument("--lookups", type=int, default=1000)
+    args = parser.parse_args()
+
+    file_ops = FileOperations()
+    with tempfile.TemporaryDirectory() as tmp:
+        work = Path(tmp)
+        tree = work / "tree"
+        container = work / "tree.pack"
+        tree.mkdir()
+        build_tree(tree, args.files, args.size)
+        print(f"{args.files} files of {args.size} bytes")
+
+        timed("copytree (baseline)", lambda: shutil.copytree(tree, work / "copy"))
+        timed("pack", lambda: file_ops.pack_directory(str(tree), str(container)))
+        timed(
+            "copy container",
+            lambda: file_ops.copy_file(str(container), str(work / "copy.pack")),
+        )
+        timed(
+            "unpack",
+            lambda: file_ops.unpack_container(str(container), str(work / "out")),
+        )
+
+        names = [
+            f"d{i % 100:02d}/f{i}.txt"
+            for i in random.sample(range(args.files), args.lookups)
+        ]
+        elapsed = timed(
+            f"{args.lookups} member lookups",
+            lambda: [file_ops.read_member(str(container), name) for name in names],
+        )
+        print(f"{'per lookup':<28} {elapsed / args.lookups * 1e6:8.1f}us")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,15 +5,28 @@ from rich.console import Console
 
 from .operations.file_operations import FileOperations
 from .utils.exceptions import FileToolError
+from .utils.helpers import parse_size
+from .utils.throttle import Throttle
 
 console = Console()
 file_ops = FileOperations()
 
 
 @click.group()
-def cli() -> None:
+@click.option("--max-rate", help="Bandwidth limit in bytes/sec, e.g. 200M")
+@click.option(
+    "--max-iops",
+    type=click.IntRange(min=1),
+    help="Limit on I/O operations per second",
+)
+def cli(max_rate: Optional[str] = None, max_iops: Optional[int] = None) -> None:
     """File manipulation tool for common operations."""
-    pass
+    try:
+        rate = parse_size(max_rate) if max_rate else None
+        file_ops.throttle = Throttle(rate, max_iops) if rate or max_iops else None
+    except FileToolError as e:
+        console.print(f"[red]Error: {str(e)}[/red]")
+        raise click.Abort()
 
 
 @cli.command()
@@ -46,10 +59,16 @@ def copy(source: str, destination: str) -> None:
 @click.argument("first")
 @click.argument("second")
 @click.argument("output")
-def combine(first: str, second: str, output: str) -> None:
+@click.option(
+    "--incremental",
+    "-i",
+    is_flag=True,
+    help="Append only data added to the inputs since the last incremental run",
+)
+def combine(first: str, second: str, output: str, incremental: bool = False) -> None:
     """Combine two files into a third file."""
     try:
-        file_ops.combine_files(first, second, output)
+        file_ops.combine_files(first, second, output, incremental)
         console.print(f"[green]Combined {first} and {second} into {output}[/green]")
     except FileToolError as e:
         console.print(f"[red]Error: {str(e)}[/red]")
@@ -68,5 +87,36 @@ def delete(path: str) -> None:
         raise click.Abort()
 
 
+@cli.command()
+@click.argument("source")
+@click.argument("container")
+def pack(source: str, container: str) -> None:
+    """Pack a directory into a single indexed container file."""
+    try:
+        count = file_ops.pack_directory(source, container)
+        console.print(
+            f"[green]Packed {count} files from {source} into {container}[/green]"
+        )
+    except FileToolError as e:
+        console.print(f"[red]Error: {str(e)}[/red]")
+        raise click.Abort()
+
+
+@cli.command()
+@click.argument("container")
+@click.argument("destination")
+@click.option(
+    "--member", "-m", multiple=True, help="Extract only this member (repeatable)"
+)
+def unpack(container: str, destination: str, member: tuple[str, ...] = ()) -> None:
+    """Extract files from a container into a directory."""
+    try:
+        count = file_ops.unpack_container(container, destination, list(member) or None)
+        console.print(f"[green]Unpacked {count} files into {destination}[/green]")
+    except FileToolError as e:
+        console.print(f"[red]Error: {str(e)}[/red]")
+        raise click.Abort()
+
+
 if __name__ == "__main__":
     cli()
@@ -0,0 +1,175 @@
+"""Indexed container format used by pack and unpack.
+
+Layout::
+
+    [member data ...][bucket 0]...[bucket N-1][slot table][trailer]
+
+Each bucket is a msgpack map from relative POSIX path (a UTF-8 string) to
+``[offset, length, mode, mtime_ns]``; a path lives in bucket
+``crc32(path) % N``. The slot table holds the ``(offset, length)`` of every
+bucket and the trailer records where the table starts and how many buckets
+there are. Looking up one member therefore costs a fixed number of ``pread``
+calls and decodes a handful of entries, however large the container is.
+"""
+
+import io
+import os
+import struct
+import zlib
+from pathlib import Path, PurePosixPath
+from typing import Any, Iterator, NamedTuple
+
+import msgpack
+
+from ..utils.exceptions import FileToolError
+
+MAGIC = b"FTPACK01"
+TRAILER = struct.Struct("<QQ8s")
+SLOT = struct.Struct("<QQ")
+ENTRIES_PER_BUCKET = 8
+# Index values must fit a signed 64-bit file offset or timestamp
+MAX_FIELD = 2**63
+
+
+class Member(NamedTuple):
+    """Location and metadata of one packed file."""
+
+    offset: int
+    length: int
+    mode: int
+    mtime_ns: int
+
+
+def encode_name(name: str) -> bytes:
+    """Encode a member name, rejecting names that are not valid UTF-8.
+
+    ``os.scandir`` hands back undecodable bytes as surrogate escapes, which
+    cannot be stored as msgpack strings.
+    """
+    try:
+        return name.encode()
+    except UnicodeEncodeError:
+        raise FileToolError(f"File name is not valid UTF-8: {name!r}")
+
+
+def _bucket_of(name: str, buckets: int) -> int:
+    return zlib.crc32(encode_name(name)) % buckets
+
+
+def encode_index(members: dict[str, Member], base: int) -> bytes:
+    """Serialize the index for a container whose member data ends at ``base``."""
+    count = max(1, len(members) // ENTRIES_PER_BUCKET)
+    buckets: list[dict[str, list[int]]] = [{} for _ in range(count)]
+    for name, member in members.items():
+        buckets[_bucket_of(name, count)][name] = list(member)
+
+    blobs = [msgpack.packb(bucket) for bucket in buckets]
+    slots = []
+    offset = base
+    for blob in blobs:
+        slots.append(SLOT.pack(offset, len(blob)))
+        offset += len(blob)
+    return b"".join(blobs + slots) + TRAILER.pack(offset, count, MAGIC)
+
+
+def _read_trailer(fd: int, container: str) -> tuple[int, int]:
+    """Return the slot table offset and bucket count of a container."""
+    size = os.fstat(fd).st_size
+    if size < TRAILER.size:
+        raise FileToolError(f"Not a file-tool container: {container}")
+
+    table, count, magic = TRAILER.unpack(
+        os.pread(fd, TRAILER.size, size - TRAILER.size)
+    )
+    if magic != MAGIC or not count or table + count * SLOT.size != size - TRAILER.size:
+        raise FileToolError(f"Not a file-tool container: {container}")
+    return table, count
+
+
+def _read_slot(fd: int, table: int, bucket: int, container: str) -> tuple[int, int]:
+    """Return the ``(offset, length)`` of a bucket, which must end before the table."""
+    offset, length = SLOT.unpack(os.pread(fd, SLOT.size, table + bucket * SLOT.size))
+    if offset + length > table:
+        raise FileToolError(f"Corrupt container index: {container}")
+    return offset, length
+
+
+def _decode_bucket(raw: Any, container: str) -> dict[Any, Any]:
+    if not isinstance(raw, dict):
+        raise FileToolError(f"Corrupt container index: {container}")
+    return raw
+
+
+def _decode_member(name: Any, fields: Any, data_end: int, container: str) -> Member:
+    """Validate one index entry; members must lie within the data section."""
+    if (
+        isinstance(name, str)
+        and isinstance(fields, list)
+        and len(fields) == len(Member._fields)
+        and all(type(value) is int and 0 <= value < MAX_FIELD for value in fields)
+        and fields[0] + fields[1] <= data_end
+    ):
+        return Member(*fields)
+    raise FileToolError(f"Corrupt container index: {container}")
+
+
+def read_index(fd: int, container: str) -> dict[str, Member]:
+    """Read the whole index of an open container without touching member data."""
+    table, _ = _read_trailer(fd, container)
+    first, _ = _read_slot(fd, table, 0, container)
+    index: dict[str, Member] = {}
+    try:
+        unpacker = msgpack.Unpacker(io.BytesIO(os.pread(fd, table - first, first)))
+        for raw in unpacker:
+            for name, fields in _decode_bucket(raw, container).items():
+                index[name] = _decode_member(name, fields, first, container)
+    except ValueError:
+        raise FileToolError(f"Corrupt container index: {container}")
+    return index
+
+
+def find_member(fd: int, container: str, name: str) -> Member | None:
+    """Look up a single member by reading only the bucket it hashes to."""
+    table, count = _read_trailer(fd, container)
+    bucket = _bucket_of(name, count)
+    first, first_length = _read_slot(fd, table, 0, container)
+    offset, length = (
+        (first, first_length)
+        if bucket == 0
+        else _read_slot(fd, table, bucket, container)
+    )
+    try:
+        raw = msgpack.unpackb(os.pread(fd, length, offset))
+    except ValueError:
+        raise FileToolError(f"Corrupt container index: {container}")
+
+    fields = _decode_bucket(raw, container).get(name)
+    return None if fields is None else _decode_member(name, fields, first, container)
+
+
+def walk_files(root: Path) -> Iterator[tuple[os.DirEntry[str], str]]:
+    """Yield every regular file under ``root`` with its relative POSIX name.
+
+    Names that are not valid UTF-8 are rejected up front, before any data is
+    written. Uses ``os.scandir`` so file types come from the directory listing rather
+    than a separate ``stat`` call per entry. Symlinks are not followed.
+    """
+    stack = [(str(root), "")]
+    while stack:
+        directory, prefix = stack.pop()
+        with os.scandir(directory) as entries:
+            for entry in sorted(entries, key=lambda e: e.name):
+                name = prefix + entry.name
+                encode_name(name)
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append((entry.path, name + "/"))
+                elif entry.is_file(follow_symlinks=False):
+                    yield entry, name
+
+
+def member_destination(root: Path, name: str) -> Path:
+    """Resolve where a member is extracted, refusing paths outside ``root``."""
+    member_path = PurePosixPath(name)
+    if member_path.is_absolute() or not member_path.parts or ".." in member_path.parts:
+        raise FileToolError(f"Unsafe member path: {name}")
+    return root.joinpath(*member_path.parts)
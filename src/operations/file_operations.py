@@ -1,12 +1,193 @@
+import os
+import stat
+import tempfile
 from pathlib import Path
+from typing import Any, BinaryIO
+
+import msgpack
 
 from ..utils.exceptions import FileToolError  # Use relative import
 from ..utils.helpers import validate_path
+from ..utils.throttle import Throttle
+from .container import (
+    Member,
+    encode_index,
+    find_member,
+    member_destination,
+    read_index,
+    walk_files,
+)
+
+CHUNK_SIZE = 1024 * 1024
+COMBINE_STATE_SUFFIX = ".combine-state"
+
+# Read once at import; os.umask can only be queried by setting it
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def _temp_sibling(path: Path) -> Path:
+    """Create a uniquely named empty file next to ``path`` to write into.
+
+    Unlike a fixed ``<name>.tmp`` this never clobbers an existing file or a
+    concurrent writer's temporary. The file gets the usual umask-derived mode
+    instead of mkstemp's 0600 so it can be moved over ``path`` as is.
+    """
+    fd, name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        os.fchmod(fd, 0o666 & ~_UMASK)
+    finally:
+        os.close(fd)
+    return Path(name)
+
+
+def combine_state_path(output: Path) -> Path:
+    """Return the incremental combine state file kept next to ``output``."""
+    return output.with_name(f".{output.name}{COMBINE_STATE_SUFFIX}")
+
+
+def _load_combine_state(state_path: Path) -> dict[str, Any] | None:
+    """Read incremental combine state, ignoring a missing or corrupt file."""
+    try:
+        state = msgpack.unpackb(state_path.read_bytes())
+    except (OSError, ValueError):
+        return None
+
+    if not isinstance(state, dict) or not isinstance(state.get("inputs"), list):
+        return None
+    for entry in state["inputs"]:
+        if not isinstance(entry, dict) or not isinstance(entry.get("path"), str):
+            return None
+        for key in ("dev", "inode", "offset"):
+            value = entry.get(key)
+            if type(value) is not int or value < 0:
+                return None
+    return state
+
+
+def _make_member_parents(root: Path, target: Path, created: set[Path]) -> None:
+    """Create the directories above ``target``, refusing to pass a symlink."""
+    directory = root
+    for part in target.relative_to(root).parts[:-1]:
+        directory = directory / part
+        if directory in created:
+            continue
+        if directory.is_symlink():
+            raise FileToolError(f"Unsafe member path: {directory} is a symlink")
+        directory.mkdir(exist_ok=True)
+        created.add(directory)
 
 
 class FileOperations:
     """Class handling all file operations."""
 
+    def __init__(
+        self, throttle: Throttle | None = None, chunk_size: int = CHUNK_SIZE
+    ) -> None:
+        self.throttle = throttle
+        self.chunk_size = chunk_size
+
+    def _transfer(self, source: BinaryIO, destination: BinaryIO) -> int:
+        """Copy a stream in chunks, pacing each read/write pair.
+
+        Returns:
+            The number of bytes copied
+        """
+        total = 0
+        while True:
+            chunk = source.read(self.chunk_size)
+            if self.throttle:
+                self.throttle.acquire(len(chunk), ops=2 if chunk else 1)
+            if not chunk:
+                return total
+            destination.write(chunk)
+            total += len(chunk)
+
+    def _append_range(self, source_fd: int, dest_fd: int, start: int, end: int) -> int:
+        """Append bytes ``[start, end)`` of ``source_fd`` to ``dest_fd``.
+
+        Returns:
+            The offset reached, which is short of ``end`` if the source shrank
+        """
+        offset = start
+        while offset < end:
+            count = min(self.chunk_size, end - offset)
+            if self.throttle:
+                self.throttle.acquire(count, ops=2)
+            chunk = os.pread(source_fd, count, offset)
+            if not chunk:
+                break
+            view = memoryview(chunk)
+            while view:
+                view = view[os.write(dest_fd, view) :]
+            offset += len(chunk)
+        return offset
+
+    def _combine_incremental(self, inputs: list[Path], output_path: Path) -> None:
+        """Append only the unseen tail of each input to ``output_path``.
+
+        An input whose inode changed or which is now smaller than the recorded
+        offset is treated as rotated and appended again from the start. If the
+        recorded inputs or output size no longer match, the output is rebuilt.
+        """
+        state_path = combine_state_path(output_path)
+        state = _load_combine_state(state_path)
+        output_size = output_path.stat().st_size if output_path.exists() else None
+
+        flags = os.O_WRONLY | os.O_APPEND | os.O_CREAT
+        previous: list[dict[str, Any] | None] = [None] * len(inputs)
+        if (
+            state is not None
+            and state.get("output_size") == output_size
+            and [entry["path"] for entry in state["inputs"]]
+            == [str(path) for path in inputs]
+        ):
+            previous = state["inputs"]
+        else:
+            flags |= os.O_TRUNC
+
+        entries = []
+        dest_fd = os.open(output_path, flags, 0o644)
+        try:
+            for input_path, record in zip(inputs, previous):
+                source_fd = os.open(input_path, os.O_RDONLY)
+                try:
+                    source_stat = os.fstat(source_fd)
+                    start = 0
+                    if (
+                        record is not None
+                        and record["dev"] == source_stat.st_dev
+                        and record["inode"] == source_stat.st_ino
+                        and record["offset"] <= source_stat.st_size
+                    ):
+                        start = record["offset"]
+                    offset = self._append_range(
+                        source_fd, dest_fd, start, source_stat.st_size
+                    )
+                finally:
+                    os.close(source_fd)
+                entries.append(
+                    {
+                        "path": str(input_path),
+                        "dev": source_stat.st_dev,
+                        "inode": source_stat.st_ino,
+                        "offset": offset,
+                    }
+                )
+            output_size = os.fstat(dest_fd).st_size
+        finally:
+            os.close(dest_fd)
+
+        # Write the new state atomically so a crash never leaves it half written
+        tmp_path = _temp_sibling(state_path)
+        try:
+            tmp_path.write_bytes(
+                msgpack.packb({"inputs": entries, "output_size": output_size})
+            )
+            os.replace(tmp_path, state_path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+
     @validate_path(path_args=[0])
     def create_file(self, path: str, content: str | None = None) -> None:
         """Create a new file with optional content."""
@@ -38,13 +219,20 @@ class FileOperations:
         try:
             # Ensure parent directories exist
             dest_path.parent.mkdir(parents=True, exist_ok=True)
-            dest_path.write_bytes(source_path.read_bytes())
+            with source_path.open("rb") as infile, dest_path.open("wb") as outfile:
+                self._transfer(infile, outfile)
         except OSError as e:
             raise FileToolError(f"Failed to copy file: {e}")
 
     @validate_path(path_args=[0, 1, 2])
-    def combine_files(self, first: str, second: str, output: str) -> None:
-        """Combine two files into a third file."""
+    def combine_files(
+        self, first: str, second: str, output: str, incremental: bool = False
+    ) -> None:
+        """Combine two files into a third file.
+
+        With ``incremental`` set, only data appended to the inputs since the
+        previous incremental run is copied onto the end of the output.
+        """
         first_path = Path(first)
         second_path = Path(second)
         output_path = Path(output)
@@ -58,9 +246,14 @@ class FileOperations:
             # Ensure parent directories exist
             output_path.parent.mkdir(parents=True, exist_ok=True)
 
-            with open(output_path, "w") as outfile:
-                outfile.write(first_path.read_text())
-                outfile.write(second_path.read_text())
+            if incremental:
+                self._combine_incremental([first_path, second_path], output_path)
+                return
+
+            with output_path.open("wb") as outfile:
+                for input_path in (first_path, second_path):
+                    with input_path.open("rb") as infile:
+                        self._transfer(infile, outfile)
         except OSError as e:
             raise FileToolError(f"Failed to combine files: {e}")
 
@@ -72,6 +265,153 @@ class FileOperations:
             raise FileToolError(f"File not found: {path}")
 
         try:
+            if self.throttle:
+                self.throttle.acquire()
             file_path.unlink()
         except OSError as e:
             raise FileToolError(f"Failed to delete file: {e}")
+
+    @validate_path(path_args=[0, 1])
+    def pack_directory(self, source: str, container: str) -> int:
+        """Pack every regular file under a directory into one container file.
+
+        Returns:
+            The number of files packed
+        """
+        source_path = Path(source)
+        container_path = Path(container)
+
+        if not source_path.is_dir():
+            raise FileToolError(f"Source directory not found: {source}")
+
+        # Build the container beside its destination and move it into place
+        # once complete, so an interrupted pack never leaves a file without
+        # an index where a container is expected
+        members: dict[str, Member] = {}
+        try:
+            tmp_path = _temp_sibling(container_path)
+            skip = {str(container_path), str(tmp_path)}
+            try:
+                # A large write buffer turns many tiny files into few large writes
+                with tmp_path.open("wb", buffering=self.chunk_size) as outfile:
+                    offset = 0
+                    for entry, name in walk_files(source_path):
+                        if entry.path in skip:
+                            continue
+                        entry_stat = entry.stat(follow_symlinks=False)
+                        with open(entry.path, "rb", buffering=0) as infile:
+                            length = self._transfer(infile, outfile)
+                        members[name] = Member(
+                            offset,
+                            length,
+                            stat.S_IMODE(entry_stat.st_mode),
+                            entry_stat.st_mtime_ns,
+                        )
+                        offset += length
+                    outfile.write(encode_index(members, offset))
+                os.replace(tmp_path, container_path)
+            finally:
+                tmp_path.unlink(missing_ok=True)
+        except OSError as e:
+            raise FileToolError(f"Failed to pack directory: {e}")
+        return len(members)
+
+    @validate_path(path_args=[0, 1])
+    def unpack_container(
+        self, container: str, destination: str, members: list[str] | None = None
+    ) -> int:
+        """Extract all members, or only the named ones, from a container.
+
+        Returns:
+            The number of files extracted
+        """
+        container_path = Path(container)
+        dest_path = Path(destination)
+
+        if not container_path.exists():
+            raise FileToolError(f"Container not found: {container}")
+
+        try:
+            container_fd = os.open(container_path, os.O_RDONLY)
+            try:
+                if members is None:
+                    selected = read_index(container_fd, container)
+                else:
+                    # Resolve each name through its hash bucket only
+                    selected = {}
+                    for name in members:
+                        found = find_member(container_fd, container, name)
+                        if found is None:
+                            raise FileToolError(f"Member not found: {name}")
+                        selected[name] = found
+
+                dest_path.mkdir(parents=True, exist_ok=True)
+                created = {dest_path}
+                # Extract in offset order so the container is read sequentially
+                for name, member in sorted(
+                    selected.items(), key=lambda item: item[1].offset
+                ):
+                    target = member_destination(dest_path, name)
+                    _make_member_parents(dest_path, target, created)
+                    self._extract_member(container_fd, container, member, target)
+            finally:
+                os.close(container_fd)
+        except OSError as e:
+            raise FileToolError(f"Failed to unpack container: {e}")
+        return len(selected)
+
+    def _extract_member(
+        self, container_fd: int, container: str, member: Member, target: Path
+    ) -> None:
+        """Write one member to ``target`` and restore its mode and mtime.
+
+        An existing symlink at ``target`` is replaced rather than followed, and
+        setuid, setgid and sticky bits from the container are dropped.
+        """
+        if target.is_symlink():
+            target.unlink()
+        flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | os.O_NOFOLLOW
+        target_fd = os.open(target, flags, 0o600)
+        try:
+            end = member.offset + member.length
+            if self._append_range(container_fd, target_fd, member.offset, end) != end:
+                raise FileToolError(f"Container is truncated: {container}")
+            os.fchmod(target_fd, member.mode & 0o777)
+            os.utime(target_fd, ns=(member.mtime_ns, member.mtime_ns))
+        finally:
+            os.close(target_fd)
+
+    @validate_path(path_args=[0])
+    def read_member(self, container: str, name: str) -> bytes:
+        """Read a single member by name using the index, without scanning."""
+        container_path = Path(container)
+        if not container_path.exists():
+            raise FileToolError(f"Container not found: {container}")
+
+        try:
+            container_fd = os.open(container_path, os.O_RDONLY)
+            try:
+                member = find_member(container_fd, container, name)
+                if member is None:
+                    raise FileToolError(f"Member not found: {name}")
+                if self.throttle:
+                    self.throttle.acquire(member.length)
+                # A single read is capped (about 2 GiB on Linux), so keep going
+                # until the whole member is in; only EOF means truncation
+                chunks = []
+                remaining = member.length
+                while remaining:
+                    chunk = os.pread(
+                        container_fd,
+                        remaining,
+                        member.offset + member.length - remaining,
+                    )
+                    if not chunk:
+                        raise FileToolError(f"Container is truncated: {container}")
+                    chunks.append(chunk)
+                    remaining -= len(chunk)
+            finally:
+                os.close(container_fd)
+        except OSError as e:
+            raise FileToolError(f"Failed to read member: {e}")
+        return b"".join(chunks)
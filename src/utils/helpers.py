@@ -1,3 +1,4 @@
+import math
 import os
 from functools import wraps
 from pathlib import Path
@@ -58,3 +59,32 @@ def validate_path(path_args: List[int]) -> Callable[[F], F]:
         return cast(F, wrapper)
 
     return decorator
+
+
+_SIZE_UNITS = {"": 1, "K": 1024, "M": 1024**2, "G": 1024**3, "T": 1024**4}
+
+
+def parse_size(value: str) -> int:
+    """Parse a human readable size such as ``200M`` or ``1.5G``.
+
+    Args:
+        value: Number with an optional K/M/G/T suffix (binary multiples)
+
+    Returns:
+        The size in bytes
+    """
+    text = value.strip().upper()
+    if text.endswith("B"):
+        text = text[:-1]
+    unit = text[-1:] if text[-1:] in _SIZE_UNITS else ""
+    number = text[: len(text) - len(unit)]
+
+    try:
+        size = float(number) * _SIZE_UNITS[unit]
+        if not math.isfinite(size):
+            raise ValueError(value)
+    except ValueError:
+        raise FileToolError(f"Invalid size: {value}")
+    if size < 1:
+        raise FileToolError(f"Size must be at least 1 byte: {value}")
+    return int(size)
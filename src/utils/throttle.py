@@ -0,0 +1,74 @@
+"""Token-bucket rate limiting for bulk file I/O."""
+
+import threading
+import time
+from typing import Callable
+
+from .exceptions import FileToolError
+
+
+class TokenBucket:
+    """Thread-safe token bucket.
+
+    Tokens refill continuously at ``rate`` per second up to ``capacity``.
+    A caller that asks for more tokens than are available reserves them
+    anyway (the balance goes negative) and sleeps until the debt is
+    repaid, so concurrent callers are paced fairly without busy-waiting.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        if rate <= 0:
+            raise FileToolError(f"Rate must be positive: {rate}")
+        self.rate = float(rate)
+        # Default to a 100ms burst so pacing stays smooth for large chunks
+        self.capacity = float(capacity) if capacity is not None else self.rate / 10
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._tokens = self.capacity
+        self._last = clock()
+
+    def consume(self, amount: float) -> float:
+        """Take ``amount`` tokens, blocking until they are available.
+
+        Returns:
+            The number of seconds the caller slept
+        """
+        if amount <= 0:
+            return 0.0
+
+        with self._lock:
+            now = self._clock()
+            elapsed = now - self._last
+            self._last = now
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._tokens -= amount
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+        # Sleep outside the lock so other threads can queue their reservations
+        if wait > 0:
+            self._sleep(wait)
+        return wait
+
+
+class Throttle:
+    """Bandwidth and IOPS limiter shared by every operation in a run."""
+
+    def __init__(
+        self, max_rate: float | None = None, max_iops: float | None = None
+    ) -> None:
+        self.bytes = TokenBucket(max_rate) if max_rate else None
+        self.ops = TokenBucket(max_iops) if max_iops else None
+
+    def acquire(self, nbytes: int = 0, ops: int = 1) -> None:
+        """Account for ``ops`` I/O operations transferring ``nbytes`` bytes."""
+        if self.ops is not None:
+            self.ops.consume(ops)
+        if self.bytes is not None:
+            self.bytes.consume(nbytes)
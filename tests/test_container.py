@@ -0,0 +1,168 @@
+import os
+from pathlib import Path
+
+import msgpack
+import pytest
+
+from src.operations.container import (
+    MAGIC,
+    SLOT,
+    TRAILER,
+    Member,
+    encode_index,
+    find_member,
+    member_destination,
+    read_index,
+    walk_files,
+)
+from src.utils.exceptions import FileToolError
+
+
+def write_container(path, data, members):
+    path.write_bytes(data + encode_index(members, len(data)))
+    return os.open(path, os.O_RDONLY)
+
+
+def test_index_round_trip(tmp_path):
+    members = {
+        "a.txt": Member(0, 3, 0o644, 1),
+        "dir/b.txt": Member(3, 2, 0o600, 2),
+    }
+    fd = write_container(tmp_path / "test.pack", b"abcde", members)
+    try:
+        assert read_index(fd, "test.pack") == members
+    finally:
+        os.close(fd)
+
+
+def test_index_trailer_layout(tmp_path):
+    encoded = encode_index({}, 100)
+    table, count, magic = TRAILER.unpack(encoded[-TRAILER.size :])
+    assert magic == MAGIC
+    assert count == 1
+    assert table == 100 + len(encoded) - TRAILER.size - SLOT.size
+
+
+def test_find_member_across_buckets(tmp_path):
+    members = {f"dir/{i}.txt": Member(i, 1, 0o644, i) for i in range(1000)}
+    fd = write_container(tmp_path / "test.pack", b"x" * 1000, members)
+    try:
+        assert read_index(fd, "test.pack") == members
+        for name in ["dir/0.txt", "dir/517.txt", "dir/999.txt"]:
+            assert find_member(fd, "test.pack", name) == members[name]
+        assert find_member(fd, "test.pack", "dir/1000.txt") is None
+    finally:
+        os.close(fd)
+
+
+@pytest.mark.parametrize("content", [b"", b"short", b"x" * 64])
+def test_read_index_not_a_container(tmp_path, content):
+    path = tmp_path / "plain.txt"
+    path.write_bytes(content)
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        with pytest.raises(FileToolError, match="Not a file-tool container"):
+            read_index(fd, str(path))
+    finally:
+        os.close(fd)
+
+
+def write_raw_container(path, data, buckets, slots=None):
+    """Write a container from hand-built buckets, bypassing encode_index."""
+    blobs = [msgpack.packb(bucket) for bucket in buckets]
+    if slots is None:
+        slots, offset = [], len(data)
+        for blob in blobs:
+            slots.append((offset, len(blob)))
+            offset += len(blob)
+    table = len(data) + sum(len(blob) for blob in blobs)
+    path.write_bytes(
+        data
+        + b"".join(blobs)
+        + b"".join(SLOT.pack(*slot) for slot in slots)
+        + TRAILER.pack(table, len(slots), MAGIC)
+    )
+    return os.open(path, os.O_RDONLY)
+
+
+@pytest.mark.parametrize(
+    "bucket",
+    [
+        {b"a.txt": [0, 1, 0o644, 0]},
+        {"a.txt": ["0", "1", "x", "y"]},
+        {"a.txt": [0, 1, 0o644]},
+        {"a.txt": [0, -1, 0o644, 0]},
+        {"a.txt": [0, 1, 0o644, True]},
+        {"a.txt": [4, 100, 0o644, 0]},
+        {"a.txt": {"offset": 0}},
+        [1, 2, 3],
+    ],
+)
+def test_read_index_malformed_entries(tmp_path, bucket):
+    path = tmp_path / "bad.pack"
+    fd = write_raw_container(path, b"abcde", [bucket])
+    try:
+        with pytest.raises(FileToolError, match="Corrupt container index"):
+            read_index(fd, str(path))
+        if isinstance(bucket, list) or "a.txt" in bucket:
+            with pytest.raises(FileToolError, match="Corrupt container index"):
+                find_member(fd, str(path), "a.txt")
+    finally:
+        os.close(fd)
+
+
+def test_read_index_slot_out_of_range(tmp_path):
+    path = tmp_path / "bad.pack"
+    fd = write_raw_container(
+        path, b"abcde", [{"a.txt": [0, 1, 0o644, 0]}], slots=[(5, 2**62)]
+    )
+    try:
+        with pytest.raises(FileToolError, match="Corrupt container index"):
+            read_index(fd, str(path))
+        with pytest.raises(FileToolError, match="Corrupt container index"):
+            find_member(fd, str(path), "a.txt")
+    finally:
+        os.close(fd)
+
+
+def test_find_member_non_utf8_name(tmp_path):
+    fd = write_container(tmp_path / "test.pack", b"", {})
+    try:
+        with pytest.raises(FileToolError, match="not valid UTF-8"):
+            find_member(fd, "test.pack", "bad\udcff.txt")
+    finally:
+        os.close(fd)
+
+
+def test_read_index_corrupt(tmp_path):
+    path = tmp_path / "corrupt.pack"
+    path.write_bytes(b"\xc1" + SLOT.pack(0, 1) + TRAILER.pack(1, 1, MAGIC))
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        with pytest.raises(FileToolError, match="Corrupt container index"):
+            read_index(fd, str(path))
+        with pytest.raises(FileToolError, match="Corrupt container index"):
+            find_member(fd, str(path), "a.txt")
+    finally:
+        os.close(fd)
+
+
+def test_walk_files(tmp_path):
+    (tmp_path / "b.txt").write_text("b")
+    (tmp_path / "a" / "nested").mkdir(parents=True)
+    (tmp_path / "a" / "nested" / "c.txt").write_text("c")
+    (tmp_path / "empty").mkdir()
+    (tmp_path / "link").symlink_to(tmp_path / "b.txt")
+
+    names = sorted(name for _, name in walk_files(tmp_path))
+    assert names == ["a/nested/c.txt", "b.txt"]
+
+
+def test_member_destination(tmp_path):
+    assert member_destination(tmp_path, "dir/file.txt") == tmp_path / "dir" / "file.txt"
+
+
+@pytest.mark.parametrize("name", ["", "/etc/passwd", "../escape.txt", "a/../../b"])
+def test_member_destination_unsafe(tmp_path, name):
+    with pytest.raises(FileToolError, match="Unsafe member path"):
+        member_destination(tmp_path, name)
@@ -1,9 +1,15 @@
+import os
+import time
 from pathlib import Path
 
+import msgpack
 import pytest
 
-from src.operations.file_operations import FileOperations
+from src.operations import file_operations
+from src.operations.container import Member, encode_index
+from src.operations.file_operations import FileOperations, combine_state_path
 from src.utils.exceptions import FileToolError
+from src.utils.throttle import Throttle
 
 
 @pytest.fixture
@@ -151,10 +157,10 @@ def test_copy_file_permission_error(file_ops, tmp_path, monkeypatch):
     dest_path = tmp_path / "dest.txt"
     source_path.write_text("test content")
 
-    def mock_write_bytes(*args, **kwargs):
+    def mock_open(*args, **kwargs):
         raise OSError("Permission denied")
 
-    monkeypatch.setattr(Path, "write_bytes", mock_write_bytes)
+    monkeypatch.setattr(Path, "open", mock_open)
 
     with pytest.raises(FileToolError, match="Failed to copy file"):
         file_ops.copy_file(str(source_path), str(dest_path))
@@ -222,3 +228,489 @@ def test_delete_file_permission_error(file_ops, tmp_path, monkeypatch):
 
     with pytest.raises(FileToolError, match="Failed to delete file"):
         file_ops.delete_file(str(file_path))
+
+
+def test_copy_file_in_chunks(tmp_path):
+    """Test copying a file larger than the chunk size"""
+    file_ops = FileOperations(chunk_size=7)
+    source = tmp_path / "source.bin"
+    dest = tmp_path / "dest.bin"
+    source.write_bytes(bytes(range(256)) * 3)
+
+    file_ops.copy_file(str(source), str(dest))
+    assert dest.read_bytes() == source.read_bytes()
+
+
+def test_copy_file_throttled_rate(tmp_path):
+    """Test the achieved copy rate stays close to --max-rate"""
+    rate = 4 * 1024 * 1024
+    throttle = Throttle(max_rate=rate)
+    file_ops = FileOperations(throttle=throttle, chunk_size=64 * 1024)
+    source = tmp_path / "source.bin"
+    dest = tmp_path / "dest.bin"
+    source.write_bytes(b"x" * 2 * 1024 * 1024)
+
+    start = time.monotonic()
+    file_ops.copy_file(str(source), str(dest))
+    elapsed = time.monotonic() - start
+
+    # The initial burst is free, everything after it is paced
+    achieved = (source.stat().st_size - throttle.bytes.capacity) / elapsed
+    assert achieved == pytest.approx(rate, rel=0.2)
+    assert dest.read_bytes() == source.read_bytes()
+
+
+def test_combine_files_throttled_ops(tmp_path):
+    """Test combine charges one op per read and write"""
+    calls = []
+
+    class RecordingThrottle(Throttle):
+        def acquire(self, nbytes=0, ops=1):
+            calls.append((nbytes, ops))
+
+    file_ops = FileOperations(throttle=RecordingThrottle(), chunk_size=4)
+    first = tmp_path / "first.txt"
+    second = tmp_path / "second.txt"
+    output = tmp_path / "output.txt"
+    first.write_text("abcdef")
+    second.write_text("gh")
+
+    file_ops.combine_files(str(first), str(second), str(output))
+    assert output.read_text() == "abcdefgh"
+    assert calls == [(4, 2), (2, 2), (0, 1), (2, 2), (0, 1)]
+
+
+def test_delete_file_throttled(tmp_path):
+    """Test delete counts as a single throttled operation"""
+    throttle = Throttle(max_iops=1000)
+    file_ops = FileOperations(throttle=throttle)
+    file_path = tmp_path / "test.txt"
+    file_path.write_text("test content")
+
+    file_ops.delete_file(str(file_path))
+    assert not file_path.exists()
+    assert throttle.ops._tokens == pytest.approx(throttle.ops.capacity - 1, abs=0.5)
+
+
+def test_combine_files_incremental_first_run(file_ops, tmp_path):
+    """Test the first incremental run writes everything and records state"""
+    first = tmp_path / "first.log"
+    second = tmp_path / "second.log"
+    output = tmp_path / "output.log"
+    first.write_text("a1\n")
+    second.write_text("b1\n")
+
+    file_ops.combine_files(str(first), str(second), str(output), incremental=True)
+    assert output.read_text() == "a1\nb1\n"
+
+    state = msgpack.unpackb(combine_state_path(output).read_bytes())
+    assert [entry["offset"] for entry in state["inputs"]] == [3, 3]
+    assert state["output_size"] == 6
+
+
+def test_combine_files_incremental_appends_tail(file_ops, tmp_path):
+    """Test later incremental runs only append newly written data"""
+    first = tmp_path / "first.log"
+    second = tmp_path / "second.log"
+    output = tmp_path / "output.log"
+    first.write_text("a1\n")
+    second.write_text("b1\n")
+    file_ops.combine_files(str(first), str(second), str(output), incremental=True)
+
+    with first.open("a") as f:
+        f.write("a2\n")
+    with second.open("a") as f:
+        f.write("b2\n")
+    file_ops.combine_files(str(first), str(second), str(output), incremental=True)
+    assert output.read_text() == "a1\nb1\na2\nb2\n"
+
+    # Nothing new means nothing is written
+    file_ops.combine_files(str(first), str(second), str(output), incremental=True)
+    assert output.read_text() == "a1\nb1\na2\nb2\n"
+
+
+def test_combine_files_incremental_reads_only_new_data(tmp_path, monkeypatch):
+    """Test the cost of a run is proportional to the new data"""
+    file_ops = FileOperations(chunk_size=4)
+    first = tmp_path / "first.log"
+    second = tmp_path / "second.log"
+    output = tmp_path / "output.log"
+    first.write_text("x" * 100)
+    second.write_text("y" * 100)
+    file_ops.combine_files(str(first), str(second), str(output), incremental=True)
+
+    reads = []
+    real_pread = os.pread
+
+    def recording_pread(fd, count, offset):
+        reads.append((count, offset))
+        return real_pread(fd, count, offset)
+
+    monkeypatch.setattr(os, "pread", recording_pread)
+    with first.open("a") as f:
+        f.write("new")
+    file_ops.combine_files(str(first), str(second), str(output), incremental=True)
+
+    assert reads == [(3, 100)]
+    assert output.read_text().endswith("y" * 100 + "new")
+
+
+def test_combine_files_incremental_detects_truncation(file_ops, tmp_path):
+    """Test a truncated input is appended again from the start"""
+    first = tmp_path / "first.log"
+    second = tmp_path / "second.log"
+    output = tmp_path / "output.log"
+    first.write_text("old line\n")
+    second.write_text("b1\n")
+    file_ops.combine_files(str(first), str(second), str(output), incremental=True)
+
+    first.write_text("new\n")
+    file_ops.combine_files(str(first), str(second), str(output), incremental=True)
+    assert output.read_text() == "old line\nb1\nnew\n"
+
+
+def test_combine_files_incremental_detects_rotation(file_ops, tmp_path):
+    """Test a replaced input with a new inode is appended from the start"""
+    first = tmp_path / "first.log"
+    second = tmp_path / "second.log"
+    output = tmp_path / "output.log"
+    first.write_text("a1\n")
+    second.write_text("b1\n")
+    file_ops.combine_files(str(first), str(second), str(output), incremental=True)
+
+    rotated = tmp_path / "first.log.new"
+    rotated.write_text("rotated a1\n")
+    os.replace(rotated, first)
+    file_ops.combine_files(str(first), str(second), str(output), incremental=True)
+    assert output.read_text() == "a1\nb1\nrotated a1\n"
+
+
+def test_combine_files_incremental_rebuilds_modified_output(file_ops, tmp_path):
+    """Test the output is rebuilt when it no longer matches the state"""
+    first = tmp_path / "first.log"
+    second = tmp_path / "second.log"
+    output = tmp_path / "output.log"
+    first.write_text("a1\n")
+    second.write_text("b1\n")
+    file_ops.combine_files(str(first), str(second), str(output), incremental=True)
+
+    output.write_text("tampered")
+    file_ops.combine_files(str(first), str(second), str(output), incremental=True)
+    assert output.read_text() == "a1\nb1\n"
+
+
+def test_combine_files_incremental_corrupt_state(file_ops, tmp_path):
+    """Test a corrupt state file triggers a full rebuild"""
+    first = tmp_path / "first.log"
+    second = tmp_path / "second.log"
+    output = tmp_path / "output.log"
+    first.write_text("a1\n")
+    second.write_text("b1\n")
+    output.write_text("stale")
+    combine_state_path(output).write_bytes(b"\xc1")
+
+    file_ops.combine_files(str(first), str(second), str(output), incremental=True)
+    assert output.read_text() == "a1\nb1\n"
+
+
+def test_combine_files_incremental_keeps_existing_tmp_file(file_ops, tmp_path):
+    """Test writing state never touches a user file with a .tmp name"""
+    first = tmp_path / "first.log"
+    second = tmp_path / "second.log"
+    output = tmp_path / "output.log"
+    first.write_text("a1\n")
+    second.write_text("b1\n")
+    state_path = combine_state_path(output)
+    user_tmp = state_path.with_name(state_path.name + ".tmp")
+    user_tmp.write_text("mine")
+
+    file_ops.combine_files(str(first), str(second), str(output), incremental=True)
+    assert user_tmp.read_text() == "mine"
+    assert msgpack.unpackb(state_path.read_bytes())["output_size"] == 6
+    assert sorted(path.name for path in tmp_path.iterdir()) == sorted(
+        ["first.log", "second.log", "output.log", state_path.name, user_tmp.name]
+    )
+
+
+@pytest.mark.parametrize(
+    "state",
+    [
+        [1, 2],
+        {"inputs": [1, 2]},
+        {"inputs": "first.log"},
+        {"inputs": [{"path": "first.log", "dev": 1, "inode": 2, "offset": "3"}]},
+        {"inputs": [{"path": "first.log", "dev": 1, "inode": 2}]},
+    ],
+)
+def test_combine_files_incremental_malformed_state(file_ops, tmp_path, state):
+    """Test valid msgpack with the wrong shape triggers a full rebuild"""
+    first = tmp_path / "first.log"
+    second = tmp_path / "second.log"
+    output = tmp_path / "output.log"
+    first.write_text("a1\n")
+    second.write_text("b1\n")
+    output.write_text("stale")
+    combine_state_path(output).write_bytes(msgpack.packb(state))
+
+    file_ops.combine_files(str(first), str(second), str(output), incremental=True)
+    assert output.read_text() == "a1\nb1\n"
+
+
+@pytest.fixture
+def packed_tree(tmp_path):
+    """Create a small directory tree to pack."""
+    source = tmp_path / "tree"
+    (source / "sub" / "deeper").mkdir(parents=True)
+    (source / "top.txt").write_text("top")
+    (source / "sub" / "mid.bin").write_bytes(bytes(range(256)) * 10)
+    (source / "sub" / "deeper" / "empty.txt").touch()
+    (source / "sub" / "mid.bin").chmod(0o600)
+    os.utime(source / "top.txt", ns=(1_000_000_000, 1_000_000_000))
+    return source
+
+
+def test_pack_and_unpack_directory(file_ops, packed_tree, tmp_path):
+    container = tmp_path / "tree.pack"
+    restored = tmp_path / "restored"
+
+    assert file_ops.pack_directory(str(packed_tree), str(container)) == 3
+    assert file_ops.unpack_container(str(container), str(restored)) == 3
+
+    for name in ["top.txt", "sub/mid.bin", "sub/deeper/empty.txt"]:
+        assert (restored / name).read_bytes() == (packed_tree / name).read_bytes()
+    assert (restored / "sub" / "mid.bin").stat().st_mode & 0o777 == 0o600
+    assert (restored / "top.txt").stat().st_mtime_ns == 1_000_000_000
+
+
+def test_pack_directory_skips_container_inside_source(file_ops, packed_tree):
+    container = packed_tree / "self.pack"
+    assert file_ops.pack_directory(str(packed_tree), str(container)) == 3
+
+
+def test_pack_directory_failure_leaves_no_container(
+    file_ops, packed_tree, tmp_path, monkeypatch
+):
+    """Test an interrupted pack leaves neither a partial nor a temp file"""
+    container = tmp_path / "tree.pack"
+    container.write_bytes(b"previous")
+
+    def failing_transfer(*args, **kwargs):
+        raise OSError("Disk full")
+
+    monkeypatch.setattr(file_ops, "_transfer", failing_transfer)
+    with pytest.raises(FileToolError, match="Failed to pack directory"):
+        file_ops.pack_directory(str(packed_tree), str(container))
+
+    assert container.read_bytes() == b"previous"
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["tree", "tree.pack"]
+
+
+def test_pack_directory_keeps_existing_tmp_file(file_ops, packed_tree, tmp_path):
+    """Test packing never touches a user file with a .tmp name"""
+    container = tmp_path / "tree.pack"
+    user_tmp = tmp_path / "tree.pack.tmp"
+    user_tmp.write_text("mine")
+
+    file_ops.pack_directory(str(packed_tree), str(container))
+    assert user_tmp.read_text() == "mine"
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        "tree",
+        "tree.pack",
+        "tree.pack.tmp",
+    ]
+
+
+def test_pack_directory_non_utf8_name(file_ops, tmp_path):
+    """Test a file name that is not valid UTF-8 is rejected cleanly"""
+    source = tmp_path / "tree"
+    source.mkdir()
+    (source / "ok.txt").write_text("ok")
+    with open(os.path.join(os.fsencode(source), b"bad\xff.txt"), "wb") as f:
+        f.write(b"bad")
+    container = tmp_path / "tree.pack"
+
+    with pytest.raises(FileToolError, match="not valid UTF-8"):
+        file_ops.pack_directory(str(source), str(container))
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["tree"]
+
+
+def test_pack_directory_source_not_found(file_ops, tmp_path):
+    with pytest.raises(FileToolError, match="Source directory not found"):
+        file_ops.pack_directory(str(tmp_path / "missing"), str(tmp_path / "out.pack"))
+
+
+def test_pack_directory_permission_error(file_ops, packed_tree, tmp_path, monkeypatch):
+    def mock_open(*args, **kwargs):
+        raise OSError("Permission denied")
+
+    monkeypatch.setattr(Path, "open", mock_open)
+
+    with pytest.raises(FileToolError, match="Failed to pack directory"):
+        file_ops.pack_directory(str(packed_tree), str(tmp_path / "tree.pack"))
+
+
+def test_unpack_selected_members(file_ops, packed_tree, tmp_path):
+    container = tmp_path / "tree.pack"
+    restored = tmp_path / "restored"
+    file_ops.pack_directory(str(packed_tree), str(container))
+
+    assert file_ops.unpack_container(str(container), str(restored), ["top.txt"]) == 1
+    assert (restored / "top.txt").read_text() == "top"
+    assert not (restored / "sub").exists()
+
+
+def test_unpack_selected_members_skips_full_index(
+    file_ops, packed_tree, tmp_path, monkeypatch
+):
+    """Test --member extraction resolves names without decoding the index"""
+    container = tmp_path / "tree.pack"
+    file_ops.pack_directory(str(packed_tree), str(container))
+
+    def fail_read_index(*args, **kwargs):
+        raise AssertionError("read_index should not be called")
+
+    monkeypatch.setattr(file_operations, "read_index", fail_read_index)
+    file_ops.unpack_container(str(container), str(tmp_path / "out"), ["top.txt"])
+    assert (tmp_path / "out" / "top.txt").read_text() == "top"
+
+
+def test_unpack_replaces_symlink_target(file_ops, packed_tree, tmp_path):
+    """Test an existing symlink is replaced instead of written through"""
+    container = tmp_path / "tree.pack"
+    restored = tmp_path / "restored"
+    victim = tmp_path / "victim.txt"
+    file_ops.pack_directory(str(packed_tree), str(container))
+    victim.write_text("keep me")
+    restored.mkdir()
+    (restored / "top.txt").symlink_to(victim)
+
+    file_ops.unpack_container(str(container), str(restored), ["top.txt"])
+    assert victim.read_text() == "keep me"
+    assert not (restored / "top.txt").is_symlink()
+    assert (restored / "top.txt").read_text() == "top"
+
+
+def test_unpack_refuses_symlinked_parent(file_ops, packed_tree, tmp_path):
+    """Test members are never written through a symlinked directory"""
+    container = tmp_path / "tree.pack"
+    restored = tmp_path / "restored"
+    outside = tmp_path / "outside"
+    file_ops.pack_directory(str(packed_tree), str(container))
+    outside.mkdir()
+    restored.mkdir()
+    (restored / "sub").symlink_to(outside, target_is_directory=True)
+
+    with pytest.raises(FileToolError, match="Unsafe member path"):
+        file_ops.unpack_container(str(container), str(restored), ["sub/mid.bin"])
+    assert list(outside.iterdir()) == []
+
+
+def test_unpack_drops_special_mode_bits(file_ops, tmp_path):
+    """Test setuid, setgid and sticky bits are not restored"""
+    container = tmp_path / "evil.pack"
+    data = b"#!/bin/sh\n"
+    member = Member(0, len(data), 0o6755 | 0o1000, 0)
+    container.write_bytes(data + encode_index({"run.sh": member}, len(data)))
+
+    file_ops.unpack_container(str(container), str(tmp_path / "out"))
+    assert (tmp_path / "out" / "run.sh").stat().st_mode & 0o7777 == 0o755
+
+
+def test_unpack_missing_member(file_ops, packed_tree, tmp_path):
+    container = tmp_path / "tree.pack"
+    file_ops.pack_directory(str(packed_tree), str(container))
+
+    with pytest.raises(FileToolError, match="Member not found"):
+        file_ops.unpack_container(str(container), str(tmp_path / "out"), ["nope"])
+
+
+def test_unpack_container_not_found(file_ops, tmp_path):
+    with pytest.raises(FileToolError, match="Container not found"):
+        file_ops.unpack_container(str(tmp_path / "missing.pack"), str(tmp_path))
+
+
+def test_unpack_truncated_container(file_ops, packed_tree, tmp_path, monkeypatch):
+    """Test hitting EOF inside a member is reported as truncation"""
+    container = tmp_path / "tree.pack"
+    file_ops.pack_directory(str(packed_tree), str(container))
+    data_end = sum(path.stat().st_size for path in packed_tree.rglob("*.*"))
+    real_pread = os.pread
+
+    def eof_in_data(fd, count, offset):
+        return b"" if offset < data_end else real_pread(fd, count, offset)
+
+    monkeypatch.setattr(os, "pread", eof_in_data)
+    with pytest.raises(FileToolError, match="Container is truncated"):
+        file_ops.unpack_container(str(container), str(tmp_path / "out"))
+
+
+def test_read_member_reads_one_bucket(file_ops, packed_tree, tmp_path, monkeypatch):
+    """Test a member is read directly at its offset without scanning"""
+    container = tmp_path / "tree.pack"
+    file_ops.pack_directory(str(packed_tree), str(container))
+
+    reads = []
+    real_pread = os.pread
+
+    def recording_pread(fd, count, offset):
+        reads.append((count, offset))
+        return real_pread(fd, count, offset)
+
+    monkeypatch.setattr(os, "pread", recording_pread)
+    data = file_ops.read_member(str(container), "sub/mid.bin")
+
+    assert data == (packed_tree / "sub" / "mid.bin").read_bytes()
+    # Trailer, bucket slot, bucket, then the member itself
+    assert len(reads) == 4
+    assert reads[-1][0] == len(data)
+
+
+def test_read_member_handles_short_reads(file_ops, packed_tree, tmp_path, monkeypatch):
+    """Test a member larger than one read is assembled from several reads"""
+    container = tmp_path / "tree.pack"
+    file_ops.pack_directory(str(packed_tree), str(container))
+    real_pread = os.pread
+
+    def short_pread(fd, count, offset):
+        return real_pread(fd, min(count, 1000), offset)
+
+    monkeypatch.setattr(os, "pread", short_pread)
+    data = file_ops.read_member(str(container), "sub/mid.bin")
+    assert data == (packed_tree / "sub" / "mid.bin").read_bytes()
+
+
+def test_read_member_truncated(file_ops, packed_tree, tmp_path, monkeypatch):
+    """Test hitting EOF inside a member is reported as truncation"""
+    container = tmp_path / "tree.pack"
+    file_ops.pack_directory(str(packed_tree), str(container))
+    data_end = sum(path.stat().st_size for path in packed_tree.rglob("*.*"))
+    real_pread = os.pread
+
+    def eof_in_data(fd, count, offset):
+        return b"" if offset < data_end else real_pread(fd, count, offset)
+
+    monkeypatch.setattr(os, "pread", eof_in_data)
+    with pytest.raises(FileToolError, match="Container is truncated"):
+        file_ops.read_member(str(container), "sub/mid.bin")
+
+
+def test_read_member_not_found(file_ops, packed_tree, tmp_path):
+    container = tmp_path / "tree.pack"
+    file_ops.pack_directory(str(packed_tree), str(container))
+
+    with pytest.raises(FileToolError, match="Member not found"):
+        file_ops.read_member(str(container), "missing.txt")
+    with pytest.raises(FileToolError, match="Container not found"):
+        file_ops.read_member(str(tmp_path / "missing.pack"), "top.txt")
+
+
+def test_copy_and_delete_container_as_unit(file_ops, packed_tree, tmp_path):
+    container = tmp_path / "tree.pack"
+    copied = tmp_path / "copy.pack"
+    file_ops.pack_directory(str(packed_tree), str(container))
+
+    file_ops.copy_file(str(container), str(copied))
+    file_ops.delete_file(str(container))
+
+    assert not container.exists()
+    assert file_ops.read_member(str(copied), "top.txt") == b"top"
@@ -4,7 +4,7 @@ from pathlib import Path
 import pytest
 
 from src.utils.exceptions import FileToolError
-from src.utils.helpers import validate_path
+from src.utils.helpers import parse_size, validate_path
 
 
 def test_validate_path_special_chars(tmp_path):
@@ -140,3 +140,25 @@ def test_validate_path_with_non_string_argument():
     # Test with non-string argument
     result = dummy_func(None, 123)
     assert result == 123
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ("512", 512),
+        ("4K", 4096),
+        ("200M", 200 * 1024**2),
+        ("1.5g", int(1.5 * 1024**3)),
+        ("2TB", 2 * 1024**4),
+    ],
+)
+def test_parse_size(value, expected):
+    assert parse_size(value) == expected
+
+
+@pytest.mark.parametrize(
+    "value", ["", "fast", "M", "0", "-5K", "0.0001", "inf", "1e400", "nan"]
+)
+def test_parse_size_invalid(value):
+    with pytest.raises(FileToolError):
+        parse_size(value)
@@ -85,3 +85,91 @@ def test_delete_command_nonexistent(runner, tmp_path):
         result = runner.invoke(cli, ["delete", "nonexistent.txt"])
         assert result.exit_code != 0
         assert "Error: File not found" in result.output
+
+
+def test_copy_command_with_limits(runner, tmp_path):
+    with runner.isolated_filesystem(temp_dir=tmp_path):
+        Path("source.txt").write_text("content")
+        result = runner.invoke(
+            cli,
+            [
+                "--max-rate",
+                "200M",
+                "--max-iops",
+                "5000",
+                "copy",
+                "source.txt",
+                "dest.txt",
+            ],
+        )
+        assert result.exit_code == 0
+        assert Path("dest.txt").read_text() == "content"
+
+
+def test_invalid_max_rate(runner, tmp_path):
+    with runner.isolated_filesystem(temp_dir=tmp_path):
+        Path("source.txt").write_text("content")
+        result = runner.invoke(
+            cli, ["--max-rate", "fast", "copy", "source.txt", "dest.txt"]
+        )
+        assert result.exit_code != 0
+        assert "Error: Invalid size" in result.output
+
+
+def test_combine_command_incremental(runner, tmp_path):
+    with runner.isolated_filesystem(temp_dir=tmp_path):
+        Path("first.txt").write_text("first\n")
+        Path("second.txt").write_text("second\n")
+        args = ["combine", "--incremental", "first.txt", "second.txt", "output.txt"]
+        assert runner.invoke(cli, args).exit_code == 0
+
+        with open("first.txt", "a") as f:
+            f.write("more\n")
+        result = runner.invoke(cli, args)
+        assert result.exit_code == 0
+        assert Path("output.txt").read_text() == "first\nsecond\nmore\n"
+
+
+def test_pack_and_unpack_commands(runner, tmp_path):
+    with runner.isolated_filesystem(temp_dir=tmp_path):
+        Path("tree/sub").mkdir(parents=True)
+        Path("tree/a.txt").write_text("a")
+        Path("tree/sub/b.txt").write_text("b")
+
+        result = runner.invoke(cli, ["pack", "tree", "tree.pack"])
+        assert result.exit_code == 0
+        assert "Packed 2 files" in result.output
+
+        result = runner.invoke(cli, ["unpack", "tree.pack", "out", "-m", "sub/b.txt"])
+        assert result.exit_code == 0
+        assert "Unpacked 1 files" in result.output
+        assert Path("out/sub/b.txt").read_text() == "b"
+        assert not Path("out/a.txt").exists()
+
+
+def test_unpack_command_not_a_container(runner, tmp_path):
+    with runner.isolated_filesystem(temp_dir=tmp_path):
+        Path("plain.txt").write_text("hello")
+        result = runner.invoke(cli, ["unpack", "plain.txt", "out"])
+        assert result.exit_code != 0
+        assert "Error: Not a file-tool container" in result.output
+
+
+@pytest.mark.parametrize("args", [["--max-rate", "inf"], ["--max-rate", "0.0001"]])
+def test_invalid_max_rate_values(runner, tmp_path, args):
+    with runner.isolated_filesystem(temp_dir=tmp_path):
+        Path("source.txt").write_text("content")
+        result = runner.invoke(cli, args + ["copy", "source.txt", "dest.txt"])
+        assert result.exit_code != 0
+        assert "Error:" in result.output
+        assert not isinstance(result.exception, (OverflowError, ValueError))
+
+
+def test_invalid_max_iops(runner, tmp_path):
+    with runner.isolated_filesystem(temp_dir=tmp_path):
+        Path("source.txt").write_text("content")
+        result = runner.invoke(
+            cli, ["--max-iops", "0", "copy", "source.txt", "dest.txt"]
+        )
+        assert result.exit_code != 0
+        assert not Path("dest.txt").exists()
@@ -0,0 +1,97 @@
+import threading
+import time
+
+import pytest
+
+from src.utils.exceptions import FileToolError
+from src.utils.throttle import Throttle, TokenBucket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def test_token_bucket_burst_is_free():
+    clock = FakeClock()
+    bucket = TokenBucket(100, capacity=10, clock=clock, sleep=clock.sleep)
+
+    assert bucket.consume(10) == 0
+    assert clock.sleeps == []
+
+
+def test_token_bucket_waits_for_debt():
+    clock = FakeClock()
+    bucket = TokenBucket(100, capacity=10, clock=clock, sleep=clock.sleep)
+
+    bucket.consume(10)
+    assert bucket.consume(50) == pytest.approx(0.5)
+    assert bucket.consume(100) == pytest.approx(1.0)
+
+
+def test_token_bucket_refills_up_to_capacity():
+    clock = FakeClock()
+    bucket = TokenBucket(100, capacity=10, clock=clock, sleep=clock.sleep)
+
+    bucket.consume(10)
+    clock.now += 60
+    assert bucket.consume(10) == 0
+    assert bucket.consume(10) == pytest.approx(0.1)
+
+
+def test_token_bucket_ignores_empty_requests():
+    clock = FakeClock()
+    bucket = TokenBucket(100, capacity=0, clock=clock, sleep=clock.sleep)
+
+    assert bucket.consume(0) == 0
+    assert clock.sleeps == []
+
+
+def test_token_bucket_invalid_rate():
+    with pytest.raises(FileToolError, match="Rate must be positive"):
+        TokenBucket(0)
+
+
+def test_token_bucket_shared_across_threads():
+    """Test the aggregate rate of several threads matches the limit"""
+    rate = 2000
+    bucket = TokenBucket(rate, capacity=0)
+
+    def worker():
+        for _ in range(100):
+            bucket.consume(2)
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    start = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.monotonic() - start
+
+    assert 800 / elapsed == pytest.approx(rate, rel=0.2)
+
+
+def test_throttle_without_limits():
+    throttle = Throttle()
+    assert throttle.bytes is None
+    assert throttle.ops is None
+    throttle.acquire(1024, ops=5)
+
+
+def test_throttle_charges_both_buckets():
+    throttle = Throttle(max_rate=1000, max_iops=10)
+    throttle.bytes.capacity = throttle.bytes._tokens = 1000
+    throttle.ops.capacity = throttle.ops._tokens = 10
+
+    throttle.acquire(400, ops=3)
+    assert throttle.bytes._tokens == pytest.approx(600, abs=1)
+    assert throttle.ops._tokens == pytest.approx(7, abs=0.1)